@@ -13,6 +13,7 @@ import sys
 from pathlib import Path
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 # This allows easy placement of apps within the interior
 # foxreviews directory.
@@ -25,6 +26,9 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
 # This application object is used by any ASGI server configured to use this file.
 django_application = get_asgi_application()
 
+# Compiler et indexer les URLs au démarrage du worker, pas à la première requête
+get_resolver().reverse_dict  # noqa: B018
+
 # Import websocket application here, so apps from django_application are loaded first
 from config.websocket import websocket_application  # noqa: E402
 
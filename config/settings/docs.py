@@ -0,0 +1,14 @@
+"""
+Settings used by scripts/generate_db_documentation.py.
+
+Only the model registry is needed: no Sentry, S3 or Mailgun initialisation,
+and no required production environment variables.
+"""
+
+from .base import *  # noqa: F403
+from .base import env
+
+# GENERAL
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#secret-key
+SECRET_KEY = env("DJANGO_SECRET_KEY", default="generate-db-documentation")
@@ -1,6 +1,7 @@
 from .base import *  # noqa: F403
 from .base import INSTALLED_APPS
 from .base import MIDDLEWARE
+from .base import NAF_CACHE
 from .base import env
 
 # GENERAL
@@ -41,6 +42,7 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "",
     },
+    "naf": NAF_CACHE,
 }
 
 # EMAIL
@@ -12,6 +12,7 @@ from sentry_sdk.integrations.redis import RedisIntegration
 from .base import *  # noqa: F403
 from .base import DATABASES
 from .base import INSTALLED_APPS
+from .base import NAF_CACHE
 from .base import REDIS_URL
 from .base import SPECTACULAR_SETTINGS
 from .base import env
@@ -86,6 +87,7 @@ CACHES = {
             "IGNORE_EXCEPTIONS": True,
         },
     },
+    "naf": NAF_CACHE,
 }
 
 # SECURITY
@@ -58,13 +58,14 @@ if settings.DEBUG:
 
 # API URLS
 urlpatterns += [
+    # Auth & Account: avant les includes génériques "api/" pour que les
+    # requêtes d'auth ne parcourent pas les routes du router
+    path("api/auth/", include("foxreviews.users.api.urls")),
+    path("api/account/", include("foxreviews.users.api.urls")),
     # API base url
     path("api/", include("config.api_router")),
     # Core API endpoints
     path("api/", include("foxreviews.core.urls")),
-    # Auth & Account
-    path("api/auth/", include("foxreviews.users.api.urls")),
-    path("api/account/", include("foxreviews.users.api.urls")),
     # Billing & Tracking
     path("api/billing/", include("foxreviews.billing.urls")),
     # Reviews document ingestion (proxy -> Agent IA)
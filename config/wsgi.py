@@ -19,6 +19,7 @@ import sys
 from pathlib import Path
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 # This allows easy placement of apps within the interior
 # foxreviews directory.
@@ -30,3 +31,6 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 # file. This includes Django's development server, if the WSGI_APPLICATION
 # setting points here.
 application = get_wsgi_application()
+
+# Compiler et indexer les URLs au démarrage du worker, pas à la première requête
+get_resolver().reverse_dict  # noqa: B018
@@ -0,0 +1,27 @@
+"""
+Authentification API pour FOX-Reviews.
+
+Les permissions (core.permissions, RolePermission) lisent
+request.user.profile.role à chaque requête: on charge donc le profil avec
+le token, dans la même requête SQL.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework import authentication
+from rest_framework import exceptions
+
+
+class TokenAuthentication(authentication.TokenAuthentication):
+    """TokenAuthentication DRF qui précharge user et user.profile."""
+
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related("user", "user__profile").get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token.")) from None
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
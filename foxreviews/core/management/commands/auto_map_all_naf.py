@@ -23,6 +23,7 @@ from foxreviews.enterprise.models import Entreprise, ProLocalisation
 from foxreviews.location.models import Ville
 from foxreviews.subcategory.models import SousCategorie
 from foxreviews.subcategory.naf_mapping import NAF_TO_SUBCATEGORY
+from foxreviews.subcategory.naf_mapping import add_mapping
 
 logger = logging.getLogger(__name__)
 
@@ -511,7 +512,7 @@ class Command(BaseCommand):
                                 raise
                     
                     # Mettre à jour le mapping en mémoire (utile si --create-proloc dans le même run)
-                    NAF_TO_SUBCATEGORY[naf_code] = chosen_slug
+                    add_mapping(naf_code, chosen_slug)
                     
                 except Exception as e:
                     logger.error(f"Erreur création sous-catégorie {naf_code}: {e}")
@@ -38,7 +38,7 @@ from foxreviews.core.insee_service import InseeService
 from foxreviews.enterprise.models import Entreprise
 from foxreviews.enterprise.models import ProLocalisation
 from foxreviews.location.models import Ville
-from foxreviews.subcategory.naf_mapping import get_subcategory_from_naf
+from foxreviews.subcategory.naf_mapping import get_subcategory_pk_from_naf
 
 logger = logging.getLogger(__name__)
 
@@ -593,16 +593,16 @@ class Command(BaseCommand):
         Returns:
             bool: True si créée, False sinon
         """
-        # Trouver la sous-catégorie via NAF
-        sous_categorie = get_subcategory_from_naf(naf_code)
-        if not sous_categorie:
+        # Trouver la sous-catégorie via NAF (PK seule, sans instancier le modèle)
+        sous_categorie_id = get_subcategory_pk_from_naf(naf_code)
+        if not sous_categorie_id:
             return False
 
         # Créer ou récupérer la ProLocalisation
         try:
             proloc, created = ProLocalisation.objects.get_or_create(
                 entreprise=entreprise,
-                sous_categorie=sous_categorie,
+                sous_categorie_id=sous_categorie_id,
                 ville=ville,
                 defaults={
                     "is_active": True,
@@ -25,7 +25,7 @@ from foxreviews.core.structured_logging import structured_logger_import, metrics
 from foxreviews.enterprise.models import Entreprise
 from foxreviews.enterprise.models import ProLocalisation
 from foxreviews.location.models import Ville
-from foxreviews.subcategory.naf_mapping import get_subcategory_from_naf
+from foxreviews.subcategory.naf_mapping import get_subcategories_from_nafs
 
 logger = logging.getLogger(__name__)
 
@@ -209,10 +209,12 @@ def create_prolocalisation_batch(self, entreprise_ids: list[str]) -> dict[str, A
     )
     
     prolocs_to_create = []
-    
+
+    # Mapping NAF → SousCategorie résolu en une fois pour tout le batch
+    sous_categories = get_subcategories_from_nafs(e.naf_code for e in entreprises)
+
     for entreprise in entreprises:
-        # Mapping NAF → SousCategorie
-        sous_categorie = get_subcategory_from_naf(entreprise.naf_code)
+        sous_categorie = sous_categories.get(entreprise.naf_code)
         if not sous_categorie:
             stats['skipped'] += 1
             continue
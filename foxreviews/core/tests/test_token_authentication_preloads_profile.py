@@ -0,0 +1,14 @@
+from rest_framework.authtoken.models import Token
+
+from foxreviews.core.authentication import TokenAuthentication
+
+
+def test_token_authentication_loads_profile_in_same_query(user, django_assert_num_queries):
+    token = Token.objects.create(user=user)
+
+    with django_assert_num_queries(1):
+        auth_user, auth_token = TokenAuthentication().authenticate_credentials(token.key)
+        role = auth_user.profile.role
+
+    assert auth_token == token
+    assert role == "client"
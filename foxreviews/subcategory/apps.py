@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SubcategoryConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "foxreviews.subcategory"
+
+    def ready(self):
+        # Invalidation de l'index slug → PK utilisé par le mapping NAF
+        from . import signals  # noqa: F401
@@ -21,6 +21,7 @@ from foxreviews.category.models import Categorie
 from foxreviews.enterprise.models import Entreprise
 from foxreviews.subcategory.models import SousCategorie
 from foxreviews.subcategory.naf_mapping import NAF_TO_SUBCATEGORY
+from foxreviews.subcategory.naf_mapping import add_mapping
 
 
 # Sections NAF → Catégorie
@@ -266,7 +267,7 @@ class Command(BaseCommand):
                 # Ajouter les mappings NAF
                 for code in data["codes"]:
                     if code not in NAF_TO_SUBCATEGORY:
-                        NAF_TO_SUBCATEGORY[code] = sc_slug
+                        add_mapping(code, sc_slug)
                         mappings_ajoutes += 1
 
             if dry_run:
@@ -17,8 +17,13 @@ Usage:
 """
 
 import re
+import sys
+import time
+from collections.abc import Iterable
+from functools import lru_cache
+from types import MappingProxyType
 
-from django.core.cache import cache
+from django.core.cache import caches
 
 # =============================================================================
 # MAPPING NAF COMPLET → SOUS-CATÉGORIES
@@ -1005,11 +1010,162 @@ NAF_TO_SUBCATEGORY = {
     "01.6B": "eleveur",
 }
 
+# Dictionnaire réellement modifiable (via add_mapping() uniquement); clés et
+# valeurs internées pour que les lookups comparent par identité.
+_NAF_TO_SUBCATEGORY_MUT = {
+    sys.intern(naf_code): sys.intern(slug)
+    for naf_code, slug in NAF_TO_SUBCATEGORY.items()
+}
+# Vue en lecture seule exposée aux autres modules. Le nom est réassigné (dict
+# -> MappingProxyType) car les commandes de maintenance cherchent le texte
+# "NAF_TO_SUBCATEGORY = {" du littéral: il ne peut pas changer de nom.
+NAF_TO_SUBCATEGORY = MappingProxyType(_NAF_TO_SUBCATEGORY_MUT)  # type: ignore[assignment]
+
+
+# Cache local au process (alias "naf", cf. settings CACHES)
+cache = caches["naf"]
+
+# Code NAF sans point tel que renvoyé par l'INSEE (ex: 6201Z, 4322A)
+_NAF_NODOT_RE = re.compile(r"\d{4}[A-Z0-9]")
+
+# Incrémenté à chaque add_mapping(): invalide les résultats dérivés mémorisés
+_MAPPING_VERSION = 0
+_STATS_CACHE: tuple[int, dict] | None = None
+
+# {slug_sous_categorie: pk}, chargé en une requête à la première résolution
+# et invalidé par les signaux post_save/post_delete de SousCategorie. Les
+# autres process (workers Celery, commandes d'import) ne reçoivent pas ces
+# signaux: l'index expire donc après _SLUG_TO_PK_TTL secondes, et un slug
+# mappé absent provoque un rechargement (une fois par slug jusqu'à expiration).
+_SLUG_TO_PK_TTL = 300
+_SLUG_TO_PK: dict | None = None
+_SLUG_TO_PK_EXPIRES_AT = 0.0
+_SLUG_TO_PK_RETRIED: set[str] = set()
+
+# Index inverse {slug_sous_categorie: frozenset(codes_naf)}, construit à la
+# première utilisation et invalidé par add_mapping().
+_SUBCATEGORY_TO_NAF: dict[str, frozenset[str]] | None = None
+
 
 # =============================================================================
 # FONCTIONS UTILITAIRES
 # =============================================================================
 
+def _get_subcategory_to_naf() -> dict[str, frozenset[str]]:
+    """Retourne l'index inverse slug → codes NAF (construit une seule fois)."""
+    global _SUBCATEGORY_TO_NAF  # noqa: PLW0603
+
+    if _SUBCATEGORY_TO_NAF is None:
+        grouped: dict[str, set[str]] = {}
+        for naf_code, slug in NAF_TO_SUBCATEGORY.items():
+            grouped.setdefault(slug, set()).add(naf_code)
+        _SUBCATEGORY_TO_NAF = {
+            slug: frozenset(codes) for slug, codes in grouped.items()
+        }
+    return _SUBCATEGORY_TO_NAF
+
+
+@lru_cache(maxsize=1024)
+def _normalize_naf_code(naf_code: str) -> str:
+    """
+    Normalise un code NAF au format du mapping (ex: "6201z " -> "62.01Z").
+
+    Fonction pure: le résultat est mémorisé, les imports INSEE ne manipulant
+    qu'un petit ensemble de codes très répétés.
+    """
+    # Enlever espaces, mettre en majuscules
+    naf_code = naf_code.strip().upper()
+
+    # Normalisation de format:
+    # - INSEE renvoie souvent sans point: 6201Z / 4322A
+    # - Notre mapping est avec point: 62.01Z / 43.22A
+    if _NAF_NODOT_RE.fullmatch(naf_code):
+        naf_code = f"{naf_code[:2]}.{naf_code[2:]}"
+
+    return sys.intern(naf_code)
+
+
+@lru_cache(maxsize=2048)
+def _cache_key(naf_code: str) -> str:
+    """Clé de cache d'un code NAF normalisé (construite une fois, internée)."""
+    return sys.intern(f"naf_mapping_{naf_code}")
+
+
+def _load_slug_to_pk() -> dict:
+    """Recharge l'index slug → PK des sous-catégories (une requête)."""
+    global _SLUG_TO_PK  # noqa: PLW0603
+    from foxreviews.subcategory.models import SousCategorie
+
+    _SLUG_TO_PK = dict(SousCategorie.objects.values_list("slug", "pk"))
+    return _SLUG_TO_PK
+
+
+def _get_slug_to_pk() -> dict:
+    """Retourne l'index slug → PK, rechargé une fois expiré."""
+    global _SLUG_TO_PK_EXPIRES_AT  # noqa: PLW0603
+
+    now = time.monotonic()
+    if _SLUG_TO_PK is None or now >= _SLUG_TO_PK_EXPIRES_AT:
+        _SLUG_TO_PK_RETRIED.clear()
+        _SLUG_TO_PK_EXPIRES_AT = now + _SLUG_TO_PK_TTL
+        return _load_slug_to_pk()
+    return _SLUG_TO_PK
+
+
+def _get_pk_for_slug(slug: str):
+    """PK de la sous-catégorie, en rechargeant l'index une fois si le slug manque."""
+    pk = _get_slug_to_pk().get(slug)
+    if pk is None and slug not in _SLUG_TO_PK_RETRIED:
+        # Sous-catégorie peut-être créée par un autre process depuis le chargement
+        _SLUG_TO_PK_RETRIED.add(slug)
+        pk = _load_slug_to_pk().get(slug)
+    return pk
+
+
+def clear_slug_to_pk_cache():
+    """Invalide l'index slug → PK (appelé lors d'un ajout/suppression de SousCategorie)."""
+    global _SLUG_TO_PK  # noqa: PLW0603
+
+    _SLUG_TO_PK = None
+    _SLUG_TO_PK_RETRIED.clear()
+
+
+def get_subcategory_slug_from_naf(naf_code: str) -> str | None:
+    """
+    Retourne le slug de sous-catégorie correspondant au code NAF.
+
+    Lookup pur dans le mapping: ni cache, ni ORM.
+
+    Args:
+        naf_code: Code NAF (ex: "43.22A" ou "4322A")
+
+    Returns:
+        Slug ou None si pas de mapping
+    """
+    if not naf_code:
+        return None
+    return NAF_TO_SUBCATEGORY.get(_normalize_naf_code(naf_code))
+
+
+def get_subcategory_pk_from_naf(naf_code: str):
+    """
+    Retourne la PK de la SousCategorie correspondant au code NAF.
+
+    Aucune requête ni aller-retour cache une fois l'index slug → PK chargé:
+    à privilégier quand seule la clé étrangère est nécessaire.
+
+    Args:
+        naf_code: Code NAF (ex: "43.22A" ou "4322A")
+
+    Returns:
+        PK (UUID) ou None si pas de mapping
+    """
+    slug = get_subcategory_slug_from_naf(naf_code)
+    if not slug:
+        return None
+    return _get_pk_for_slug(slug)
+
+
 def get_subcategory_from_naf(naf_code: str):
     """
     Retourne la SousCategorie correspondant au code NAF.
@@ -1025,35 +1181,106 @@ def get_subcategory_from_naf(naf_code: str):
     if not naf_code:
         return None
 
-    # Normaliser le code NAF (enlever espaces, mettre en majuscules)
-    naf_code = naf_code.strip().upper()
+    # Code non mappé (ou sous-catégorie absente): aucun aller-retour cache
+    sous_cat_pk = get_subcategory_pk_from_naf(naf_code)
+    if sous_cat_pk is None:
+        return None
 
-    # Normalisation de format:
-    # - INSEE renvoie souvent sans point: 6201Z / 4322A
-    # - Notre mapping est avec point: 62.01Z / 43.22A
-    if re.fullmatch(r"\d{4}[A-Z0-9]", naf_code):
-        naf_code = f"{naf_code[:2]}.{naf_code[2:]}"
+    naf_code = _normalize_naf_code(naf_code)
 
     # Vérifier le cache d'abord
-    cache_key = f"naf_mapping_{naf_code}"
+    cache_key = _cache_key(naf_code)
     cached_result = cache.get(cache_key)
-    if cached_result is not None:
+    # Ignorer une instance périmée (sous-catégorie recréée depuis)
+    if cached_result is not None and cached_result.pk == sous_cat_pk:
         return cached_result
 
-    # Chercher dans le mapping
-    slug = NAF_TO_SUBCATEGORY.get(naf_code)
-    if not slug:
-        cache.set(cache_key, None, timeout=3600)
-        return None
-
     # Récupérer la sous-catégorie
-    try:
-        sous_cat = SousCategorie.objects.select_related("categorie").get(slug=slug)
+    sous_cat = (
+        SousCategorie.objects.select_related("categorie")
+        .filter(pk=sous_cat_pk)
+        .first()
+    )
+    if sous_cat is None:
+        # PK périmée (sous-catégorie supprimée/recréée par un autre process)
+        clear_slug_to_pk_cache()
+        sous_cat_pk = get_subcategory_pk_from_naf(naf_code)
+        if sous_cat_pk is None:
+            return None
+        sous_cat = (
+            SousCategorie.objects.select_related("categorie")
+            .filter(pk=sous_cat_pk)
+            .first()
+        )
+    if sous_cat is not None:
         cache.set(cache_key, sous_cat, timeout=3600)
-        return sous_cat
-    except SousCategorie.DoesNotExist:
-        cache.set(cache_key, None, timeout=3600)
-        return None
+    return sous_cat
+
+
+def get_subcategories_from_nafs(naf_codes: Iterable[str]) -> dict:
+    """
+    Version batch de get_subcategory_from_naf pour les imports.
+
+    Un seul cache.get_many, une seule requête pour les sous-catégories absentes
+    du cache, puis un seul cache.set_many, quel que soit le nombre de codes.
+
+    Args:
+        naf_codes: Codes NAF (doublons et valeurs vides tolérés)
+
+    Returns:
+        Dictionnaire {code_naf_fourni: SousCategorie ou None}
+    """
+    from foxreviews.subcategory.models import SousCategorie
+
+    codes = list(dict.fromkeys(naf_codes))
+
+    # Code fourni -> code normalisé, uniquement pour les codes mappés
+    normalized_by_code: dict[str, str] = {}
+    pk_by_normalized: dict[str, object] = {}
+    for naf_code in codes:
+        sous_cat_pk = get_subcategory_pk_from_naf(naf_code)
+        if sous_cat_pk is None:
+            continue
+        normalized = _normalize_naf_code(naf_code)
+        normalized_by_code[naf_code] = normalized
+        pk_by_normalized[normalized] = sous_cat_pk
+
+    found: dict[str, object] = {}
+    if pk_by_normalized:
+        cache_keys = {_cache_key(code): code for code in pk_by_normalized}
+        for cache_key, sous_cat in cache.get_many(list(cache_keys)).items():
+            code = cache_keys[cache_key]
+            if sous_cat is not None and sous_cat.pk == pk_by_normalized[code]:
+                found[code] = sous_cat
+
+        missing = {
+            code: sous_cat_pk
+            for code, sous_cat_pk in pk_by_normalized.items()
+            if code not in found
+        }
+        if missing:
+            by_pk = SousCategorie.objects.select_related("categorie").in_bulk(
+                set(missing.values()),
+            )
+            fetched = {
+                code: by_pk[sous_cat_pk]
+                for code, sous_cat_pk in missing.items()
+                if sous_cat_pk in by_pk
+            }
+            if len(fetched) < len(missing):
+                # PK périmées (sous-catégories recréées par un autre process):
+                # l'index est rechargé pour les résolutions suivantes
+                clear_slug_to_pk_cache()
+            cache.set_many(
+                {_cache_key(code): sous_cat for code, sous_cat in fetched.items()},
+                timeout=3600,
+            )
+            found.update(fetched)
+
+    return {
+        naf_code: found.get(normalized_by_code.get(naf_code))
+        for naf_code in codes
+    }
 
 
 def get_naf_codes_for_subcategory(sous_categorie_slug: str) -> list[str]:
@@ -1066,13 +1293,35 @@ def get_naf_codes_for_subcategory(sous_categorie_slug: str) -> list[str]:
         sous_categorie_slug: Slug de la sous-catégorie
 
     Returns:
-        Liste des codes NAF
+        Liste triée des codes NAF
+    """
+    return sorted(get_naf_code_set_for_subcategory(sous_categorie_slug))
+
+
+def get_naf_code_set_for_subcategory(sous_categorie_slug: str) -> frozenset[str]:
+    """
+    Retourne l'ensemble des codes NAF associés à une sous-catégorie.
+
+    Lookup O(1) via l'index inverse; le frozenset permet les tests
+    d'appartenance et les opérations ensemblistes entre sous-catégories.
+
+    Args:
+        sous_categorie_slug: Slug de la sous-catégorie
+
+    Returns:
+        frozenset des codes NAF (vide si aucun mapping)
     """
-    return [
-        naf_code
-        for naf_code, slug in NAF_TO_SUBCATEGORY.items()
-        if slug == sous_categorie_slug
-    ]
+    return _get_subcategory_to_naf().get(sous_categorie_slug, frozenset())
+
+
+def is_mapped_subcategory(sous_categorie_slug: str) -> bool:
+    """
+    Indique si une sous-catégorie est la cible d'au moins un code NAF.
+
+    Réutilise les clés de l'index inverse: aucun set des valeurs du mapping
+    n'est reconstruit à chaque appel.
+    """
+    return sous_categorie_slug in _get_subcategory_to_naf()
 
 
 def get_all_mappings() -> dict[str, str]:
@@ -1092,29 +1341,60 @@ def get_mapping_stats() -> dict:
     Returns:
         Dictionnaire avec les stats
     """
-    from collections import Counter
+    global _STATS_CACHE  # noqa: PLW0603
 
-    slugs = list(NAF_TO_SUBCATEGORY.values())
-    counter = Counter(slugs)
+    if _STATS_CACHE is None or _STATS_CACHE[0] != _MAPPING_VERSION:
+        from collections import Counter
 
-    return {
-        "total_naf_codes": len(NAF_TO_SUBCATEGORY),
-        "unique_subcategories": len(counter),
-        "top_10_subcategories": counter.most_common(10),
-    }
+        slugs = list(NAF_TO_SUBCATEGORY.values())
+        counter = Counter(slugs)
+
+        _STATS_CACHE = (
+            _MAPPING_VERSION,
+            {
+                "total_naf_codes": len(NAF_TO_SUBCATEGORY),
+                "unique_subcategories": len(counter),
+                "top_10_subcategories": counter.most_common(10),
+            },
+        )
+
+    stats = _STATS_CACHE[1]
+    # Copie pour que l'appelant ne puisse pas altérer le résultat mémorisé
+    return {**stats, "top_10_subcategories": list(stats["top_10_subcategories"])}
 
 
 def add_mapping(naf_code: str, sous_categorie_slug: str):
     """
     Ajoute un mapping NAF → SousCategorie dynamiquement.
 
+    Seul point d'écriture du mapping: NAF_TO_SUBCATEGORY est exposé en
+    lecture seule.
+
     Note: Ce mapping sera perdu au redémarrage. Pour un mapping permanent,
-    modifier directement le dictionnaire NAF_TO_SUBCATEGORY.
+    modifier directement le dictionnaire NAF_TO_SUBCATEGORY dans ce fichier.
 
     Args:
         naf_code: Code NAF
         sous_categorie_slug: Slug de la sous-catégorie
     """
-    NAF_TO_SUBCATEGORY[naf_code.strip().upper()] = sous_categorie_slug
+    global _MAPPING_VERSION  # noqa: PLW0603
+
+    naf_code = naf_code.strip().upper()
+    previous_slug = NAF_TO_SUBCATEGORY.get(naf_code)
+    _NAF_TO_SUBCATEGORY_MUT[sys.intern(naf_code)] = sys.intern(sous_categorie_slug)
+    _MAPPING_VERSION += 1
+
+    # Mettre à jour l'index inverse s'il est déjà construit
+    if _SUBCATEGORY_TO_NAF is not None:
+        if previous_slug is not None:
+            remaining = _SUBCATEGORY_TO_NAF.get(previous_slug, frozenset()) - {naf_code}
+            if remaining:
+                _SUBCATEGORY_TO_NAF[previous_slug] = remaining
+            else:
+                _SUBCATEGORY_TO_NAF.pop(previous_slug, None)
+        _SUBCATEGORY_TO_NAF[sous_categorie_slug] = _SUBCATEGORY_TO_NAF.get(
+            sous_categorie_slug, frozenset(),
+        ) | {naf_code}
+
     # Invalider le cache
-    cache.delete(f"naf_mapping_{naf_code.strip().upper()}")
+    cache.delete(_cache_key(naf_code))
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import SousCategorie
+from .naf_mapping import clear_slug_to_pk_cache
+
+
+@receiver(post_save, sender=SousCategorie)
+@receiver(post_delete, sender=SousCategorie)
+def reset_naf_slug_index(sender, **kwargs):
+    # L'index slug → PK du mapping NAF est rechargé à la prochaine résolution
+    clear_slug_to_pk_cache()
@@ -0,0 +1,154 @@
+import ast
+import uuid
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from django.core.cache import caches
+
+from foxreviews.category.models import Categorie
+from foxreviews.subcategory import naf_mapping
+from foxreviews.subcategory.models import SousCategorie
+from foxreviews.subcategory.naf_mapping import NAF_TO_SUBCATEGORY
+from foxreviews.subcategory.naf_mapping import _normalize_naf_code
+from foxreviews.subcategory.naf_mapping import clear_slug_to_pk_cache
+from foxreviews.subcategory.naf_mapping import get_naf_code_set_for_subcategory
+from foxreviews.subcategory.naf_mapping import get_naf_codes_for_subcategory
+from foxreviews.subcategory.naf_mapping import get_subcategories_from_nafs
+from foxreviews.subcategory.naf_mapping import get_subcategory_from_naf
+from foxreviews.subcategory.naf_mapping import get_subcategory_pk_from_naf
+from foxreviews.subcategory.naf_mapping import get_subcategory_slug_from_naf
+from foxreviews.subcategory.naf_mapping import is_mapped_subcategory
+
+
+@pytest.fixture(autouse=True)
+def _reset_naf_caches():
+    # Index slug → PK et cache "naf" sont des états de process: repartir à
+    # vide et ne rien laisser (PK de transactions annulées) aux tests suivants
+    caches["naf"].clear()
+    clear_slug_to_pk_cache()
+    yield
+    caches["naf"].clear()
+    clear_slug_to_pk_cache()
+
+
+def _plombier(categorie: Categorie) -> SousCategorie:
+    return SousCategorie(
+        categorie=categorie,
+        nom="Plombier",
+        slug="plombier",
+        description="",
+        mots_cles="",
+        ordre=1,
+    )
+
+
+@pytest.fixture
+def artisans(db) -> Categorie:
+    return Categorie.objects.create(nom="Artisans", slug="artisans", description="")
+
+
+@pytest.fixture
+def plombier(artisans: Categorie) -> SousCategorie:
+    sous_categorie = _plombier(artisans)
+    sous_categorie.save()
+    return sous_categorie
+
+
+
+def test_normalize_naf_code_adds_dot_and_uppercases():
+    assert _normalize_naf_code(" 4322a ") == "43.22A"
+    assert _normalize_naf_code("62.01z") == "62.01Z"
+
+
+def test_normalize_naf_code_leaves_unknown_formats_untouched():
+    assert _normalize_naf_code("01.4D") == "01.4D"
+    assert _normalize_naf_code("ABC") == "ABC"
+
+
+def test_subcategory_slug_from_naf_needs_no_database():
+    assert get_subcategory_slug_from_naf("4322A") == "plombier"
+    assert get_subcategory_slug_from_naf("99.99Z") is None
+    assert get_subcategory_slug_from_naf("") is None
+
+
+def test_naf_code_set_matches_forward_mapping():
+    expected = {code for code, slug in NAF_TO_SUBCATEGORY.items() if slug == "viticulteur"}
+
+    assert get_naf_code_set_for_subcategory("viticulteur") == expected
+    assert get_naf_code_set_for_subcategory("slug-inexistant") == frozenset()
+
+
+def test_is_mapped_subcategory():
+    assert is_mapped_subcategory("viticulteur")
+    assert not is_mapped_subcategory("slug-inexistant")
+
+
+def test_naf_codes_for_subcategory_are_sorted():
+    codes = get_naf_codes_for_subcategory("viticulteur")
+
+    assert codes == sorted(get_naf_code_set_for_subcategory("viticulteur"))
+
+
+def test_naf_mapping_is_read_only():
+    with pytest.raises(TypeError):
+        NAF_TO_SUBCATEGORY["43.22A"] = "autre-activite"  # type: ignore[index]
+
+
+def test_naf_mapping_literal_has_no_duplicate_codes():
+    # Une clé dupliquée dans le littéral écraserait silencieusement la première
+    source = (Path(__file__).parents[1] / "naf_mapping.py").read_text(encoding="utf-8")
+    literal = next(
+        node.value
+        for node in ast.parse(source).body
+        if isinstance(node, ast.Assign)
+        and getattr(node.targets[0], "id", None) == "NAF_TO_SUBCATEGORY"
+        and isinstance(node.value, ast.Dict)
+    )
+
+    counts = Counter(key.value for key in literal.keys)
+
+    assert [code for code, count in counts.items() if count > 1] == []
+
+
+def test_subcategory_pk_from_naf_follows_subcategory_creation(artisans: Categorie):
+    assert get_subcategory_pk_from_naf("4322A") is None
+
+    sc = _plombier(artisans)
+    sc.save()
+
+    assert get_subcategory_pk_from_naf("4322A") == sc.pk
+    assert get_subcategory_pk_from_naf("99.99Z") is None
+
+
+def test_subcategory_pk_from_naf_reloads_for_subcategory_created_elsewhere(artisans: Categorie):
+    # Index chargé avant la création, sans avoir encore cherché "plombier"
+    assert "plombier" not in naf_mapping._get_slug_to_pk()  # noqa: SLF001
+
+    # bulk_create n'envoie pas post_save: comme une création par un autre process
+    [sc] = SousCategorie.objects.bulk_create([_plombier(artisans)])
+
+    assert get_subcategory_pk_from_naf("4322A") == sc.pk
+
+
+def test_subcategories_from_nafs_resolves_batch(plombier: SousCategorie):
+    result = get_subcategories_from_nafs(["43.22A", "4322A", "99.99Z", "", "43.22A"])
+
+    assert result == {"43.22A": plombier, "4322A": plombier, "99.99Z": None, "": None}
+
+
+def test_slug_to_pk_index_expires(plombier: SousCategorie, monkeypatch):
+    stale_pk = uuid.uuid4()
+    naf_mapping._get_slug_to_pk()["plombier"] = stale_pk  # noqa: SLF001
+
+    assert get_subcategory_pk_from_naf("4322A") == stale_pk
+
+    monkeypatch.setattr(naf_mapping, "_SLUG_TO_PK_EXPIRES_AT", 0.0)
+
+    assert get_subcategory_pk_from_naf("4322A") == plombier.pk
+
+
+def test_subcategory_from_naf_recovers_from_stale_pk(plombier: SousCategorie):
+    naf_mapping._get_slug_to_pk()["plombier"] = uuid.uuid4()  # noqa: SLF001
+
+    assert get_subcategory_from_naf("4322A") == plombier
@@ -20,7 +20,9 @@ class UserProfileAdmin(admin.ModelAdmin):
         "city",
         "emergency_contact_name",
     )
+    list_select_related = ("user",)
     autocomplete_fields = ("user",)
+    raw_id_fields = ("entreprise",)
     readonly_fields = ("created_at", "updated_at")
 
 
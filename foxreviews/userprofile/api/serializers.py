@@ -8,7 +8,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
     username = serializers.CharField(source="user.username", read_only=True)
     email = serializers.EmailField(source="user.email", read_only=True)
-    role = serializers.CharField(source="role", read_only=True)
+    role = serializers.CharField(read_only=True)
 
     class Meta:
         model = UserProfile
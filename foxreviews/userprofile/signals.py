@@ -4,15 +4,19 @@ from django.dispatch import receiver
 
 from .models import UserProfile
 
-User = settings.AUTH_USER_MODEL
 
-
-@receiver(post_save, sender=User)
-def create_profile_on_user_creation(sender, instance, created, **kwargs):
-    if created:
-        # Always ensure a profile exists
-        profile, _ = UserProfile.objects.get_or_create(user=instance)
-        # If a superuser is created, enforce ADMIN role on UserProfile
-        if getattr(instance, "is_superuser", False):
-            profile.role = UserProfile.Role.ADMIN
-            profile.save(update_fields=["role"]) 
+# post_save est un ModelSignal: le sender "app_label.Model" est résolu
+# paresseusement par Django une fois le modèle chargé.
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_profile_on_user_creation(sender, instance, created, raw=False, **kwargs):
+    # raw: chargement de fixtures, le profil est fourni par la fixture
+    if not created or raw:
+        return
+    # Un utilisateur tout juste créé n'a pas encore de profil: un seul INSERT.
+    # Un superuser reçoit directement le rôle ADMIN.
+    role = (
+        UserProfile.Role.ADMIN
+        if getattr(instance, "is_superuser", False)
+        else UserProfile.Role.CLIENT
+    )
+    UserProfile.objects.create(user=instance, role=role)
@@ -3,13 +3,21 @@ Authentication and Account management API endpoints.
 Gestion des utilisateurs et comptes clients.
 """
 
+import copy
 import logging
+import re
 
+from django.contrib.auth import authenticate
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import IntegrityError
 from django.db import transaction
+from django.db.models import Case
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.utils import timezone
 from drf_spectacular.utils import OpenApiResponse
 from drf_spectacular.utils import extend_schema
 from rest_framework import serializers
@@ -21,18 +29,42 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 
+from foxreviews.enterprise.models import Entreprise
 from foxreviews.userprofile.models import UserProfile
+from foxreviews.users.tasks import send_password_reset
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+_SIREN_RE = re.compile(r"[0-9]{9}")
+_SIRET_RE = re.compile(r"[0-9]{14}")
+
 
 # ========================================================================
 # SERIALIZERS
 # ========================================================================
 
 
-class RegisterRequestSerializer(serializers.Serializer):
+class CachedFieldsSerializer(serializers.Serializer):
+    """
+    Serializer dont les champs déclarés ne sont deep-copiés qu'une fois par classe.
+
+    DRF deep-copie chaque Field déclaré à chaque instanciation; ces endpoints
+    instancient un serializer par requête. On garde un prototype non lié par
+    classe et chaque instance en reçoit une copie superficielle, liée ensuite
+    par DRF comme d'habitude.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        prototype = cls.__dict__.get("_fields_prototype")
+        if prototype is None:
+            prototype = super().get_fields()
+            cls._fields_prototype = prototype
+        return {name: copy.copy(field) for name, field in prototype.items()}
+
+
+class RegisterRequestSerializer(CachedFieldsSerializer):
     """Serializer pour l'inscription d'un utilisateur."""
 
     email = serializers.EmailField()
@@ -45,6 +77,8 @@ class RegisterRequestSerializer(serializers.Serializer):
     def validate_email(self, value):
         """Vérifie que l'email n'est pas déjà utilisé."""
         normalized = value.strip().lower()
+        # Rejeté avant la recherche d'entreprise et le hachage du mot de passe;
+        # la contrainte unique en base ne couvre plus que la concurrence.
         if User.objects.filter(email=normalized).exists():
             raise serializers.ValidationError("Cet email est déjà utilisé.")
         return normalized
@@ -53,7 +87,7 @@ class RegisterRequestSerializer(serializers.Serializer):
         normalized = value.strip()
         if not normalized:
             return ""
-        if not normalized.isdigit() or len(normalized) != 9:
+        if not _SIREN_RE.fullmatch(normalized):
             raise serializers.ValidationError("Le SIREN doit contenir exactement 9 chiffres.")
         return normalized
 
@@ -61,7 +95,7 @@ class RegisterRequestSerializer(serializers.Serializer):
         normalized = value.strip()
         if not normalized:
             return ""
-        if not normalized.isdigit() or len(normalized) != 14:
+        if not _SIRET_RE.fullmatch(normalized):
             raise serializers.ValidationError("Le SIRET doit contenir exactement 14 chiffres.")
         return normalized
 
@@ -96,7 +130,7 @@ class RegisterResponseSerializer(serializers.Serializer):
     message = serializers.CharField()
 
 
-class LoginRequestSerializer(serializers.Serializer):
+class LoginRequestSerializer(CachedFieldsSerializer):
     """Serializer pour la connexion."""
 
     email = serializers.EmailField()
@@ -114,13 +148,13 @@ class LoginResponseSerializer(serializers.Serializer):
     token = serializers.CharField()
 
 
-class PasswordResetRequestSerializer(serializers.Serializer):
+class PasswordResetRequestSerializer(CachedFieldsSerializer):
     """Serializer pour la demande de réinitialisation de mot de passe."""
 
     email = serializers.EmailField()
 
 
-class PasswordResetConfirmSerializer(serializers.Serializer):
+class PasswordResetConfirmSerializer(CachedFieldsSerializer):
     """Serializer pour la confirmation de réinitialisation de mot de passe."""
 
     token = serializers.CharField()
@@ -135,7 +169,7 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         return value
 
 
-class UserAccountSerializer(serializers.Serializer):
+class UserAccountSerializer(CachedFieldsSerializer):
     """Serializer pour les données du compte utilisateur."""
 
     id = serializers.IntegerField(read_only=True)
@@ -146,13 +180,62 @@ class UserAccountSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(read_only=True, source="date_joined")
 
 
-class UpdateAccountRequestSerializer(serializers.Serializer):
+class UpdateAccountRequestSerializer(CachedFieldsSerializer):
     """Serializer pour la mise à jour du compte."""
 
     name = serializers.CharField(max_length=255, required=False, allow_blank=True)
     phone = serializers.CharField(max_length=20, required=False, allow_blank=True)
 
 
+# ========================================================================
+# HELPERS
+# ========================================================================
+
+
+def _load_account_user(user_pk):
+    """
+    Charge l'utilisateur avec profil et entreprise en une seule requête.
+
+    Seules les colonnes lues par _build_account_response sont chargées
+    (pas de hash de mot de passe, pas de colonnes larges de l'entreprise).
+    """
+    return (
+        User.objects.select_related("profile", "profile__entreprise")
+        .only(
+            "id",
+            "email",
+            "name",
+            "date_joined",
+            "profile__role",
+            "profile__entreprise",
+            "profile__entreprise__nom",
+            "profile__entreprise__siren",
+        )
+        .get(pk=user_pk)
+    )
+
+
+def _build_account_response(user, profile) -> dict:
+    """Données du compte renvoyées par account_me et account_update."""
+    role = profile.role if profile is not None else "visiteur"
+    entreprise_data = None
+    if profile is not None and profile.entreprise is not None:
+        entreprise_data = {
+            "id": str(profile.entreprise.id),
+            "nom": profile.entreprise.nom,
+            "siren": profile.entreprise.siren,
+        }
+
+    return {
+        "id": user.id,
+        "email": user.email,
+        "name": user.name,
+        "role": role,
+        "entreprise": entreprise_data,
+        "created_at": user.date_joined,
+    }
+
+
 # ========================================================================
 # ENDPOINTS
 # ========================================================================
@@ -193,23 +276,30 @@ def register(request):
     siren = serializer.validated_data.get("siren") or ""
     siret = serializer.validated_data.get("siret") or ""
 
-    from foxreviews.enterprise.models import Entreprise
-
-    entreprise = None
+    # Seul l'id de l'entreprise est utile (FK du profil): pas d'hydratation de la ligne
     if entreprise_id:
-        try:
-            entreprise = Entreprise.objects.get(id=entreprise_id)
-        except Entreprise.DoesNotExist:
+        entreprise_pk = (
+            Entreprise.objects.filter(id=entreprise_id).values_list("id", flat=True).first()
+        )
+        if entreprise_pk is None:
             return Response(
                 {"error": "Entreprise introuvable. Veuillez vérifier votre identifiant."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
     else:
+        # Une seule requête SIRET/SIREN; à égalité le SIRET (plus précis) l'emporte
+        lookup = Q()
         if siret:
-            entreprise = Entreprise.objects.filter(siret=siret).first()
-        if entreprise is None and siren:
-            entreprise = Entreprise.objects.filter(siren=siren).first()
-        if entreprise is None:
+            lookup |= Q(siret=siret)
+        if siren:
+            lookup |= Q(siren=siren)
+        entreprises = Entreprise.objects.filter(lookup)
+        if siret and siren:
+            entreprises = entreprises.order_by(
+                Case(When(siret=siret, then=Value(0)), default=Value(1)),
+            )
+        entreprise_pk = entreprises.values_list("id", flat=True).first()
+        if entreprise_pk is None:
             return Response(
                 {"error": "Entreprise introuvable pour ce SIREN/SIRET. Veuillez vérifier vos informations."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -226,27 +316,15 @@ def register(request):
 
             # NOTE: un signal post_save (foxreviews.userprofile.signals) crée déjà
             # automatiquement un UserProfile à la création d'un User.
-            # Donc ici on fait un get_or_create + update des champs utiles.
-            profile_defaults = {"role": UserProfile.Role.CLIENT}
-            if entreprise is not None:
-                profile_defaults["entreprise"] = entreprise
+            # Donc ici un seul UPDATE des champs utiles (create en secours).
+            profile_fields = {"role": UserProfile.Role.CLIENT, "entreprise_id": entreprise_pk}
+            if not UserProfile.objects.filter(user=user).update(**profile_fields):
+                UserProfile.objects.create(user=user, **profile_fields)
 
-            profile, _ = UserProfile.objects.get_or_create(user=user, defaults=profile_defaults)
+            # Générer token (l'utilisateur vient d'être créé: aucun token existant)
+            token = Token.objects.create(user=user)
 
-            update_fields: list[str] = []
-            if profile.role != UserProfile.Role.CLIENT:
-                profile.role = UserProfile.Role.CLIENT
-                update_fields.append("role")
-            if entreprise is not None and profile.entreprise_id != entreprise.id:
-                profile.entreprise = entreprise
-                update_fields.append("entreprise")
-            if update_fields:
-                profile.save(update_fields=update_fields)
-
-            # Générer token
-            token, _ = Token.objects.get_or_create(user=user)
-
-        logger.info(f"Nouvel utilisateur inscrit: {email}")
+        logger.info("Nouvel utilisateur inscrit: %s", email)
 
         return Response(
             {
@@ -262,7 +340,14 @@ def register(request):
         )
 
     except IntegrityError as e:
-        # Ex: email déjà pris (race condition), ou tentative duplicate sur UserProfile
+        # Email pris entre la validation et la création (concurrence)
+        if User.objects.filter(email=email).exists():
+            logger.info("Inscription refusée, email déjà utilisé: %s", email)
+            return Response(
+                {"email": ["Cet email est déjà utilisé."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # Ex: tentative duplicate sur UserProfile
         logger.exception("Erreur DB lors de l'inscription: %s", e)
         return Response(
             {"error": "Inscription impossible (email déjà utilisé ou conflit de création)."},
@@ -299,8 +384,6 @@ def login(request):
     """
     Authentifier un utilisateur.
     """
-    from django.contrib.auth import authenticate
-
     serializer = LoginRequestSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
@@ -308,36 +391,36 @@ def login(request):
     password = serializer.validated_data["password"]
 
     # Django's ModelBackend expects "username" param, even when USERNAME_FIELD is "email".
-    # Passing both keeps compatibility with other backends (ex: allauth).
+    # Passing both keeps compatibility with other backends (ex: allauth, insensible à la casse).
     user = authenticate(request, username=email, email=email, password=password)
 
     if user is None:
         # Avoid leaking details to client, but keep enough info in server logs for debugging.
-        try:
-            db_user = User.objects.only("id", "is_active", "email").get(email=email)
+        is_active = (
+            User.objects.filter(email__iexact=email).values_list("is_active", flat=True).first()
+        )
+        if is_active is None:
+            logger.warning("Login failed for %s (user does not exist)", email)
+        else:
             logger.warning(
                 "Login failed for %s (user exists, is_active=%s)",
                 email,
-                db_user.is_active,
+                is_active,
             )
-        except User.DoesNotExist:
-            logger.warning("Login failed for %s (user does not exist)", email)
         return Response(
             {"error": "Email ou mot de passe incorrect"},
             status=status.HTTP_401_UNAUTHORIZED,
         )
 
-    # Générer ou récupérer token
-    token, _ = Token.objects.get_or_create(user=user)
+    # Récupérer la clé du token existant (cas courant), sinon en créer un
+    token_key = Token.objects.filter(user=user).values_list("key", flat=True).first()
+    if token_key is None:
+        token_key = Token.objects.create(user=user).key
 
-    # Récupérer le profil
-    try:
-        profile = user.profile
-        role = profile.role
-    except UserProfile.DoesNotExist:
-        role = "visiteur"
+    # Seul le rôle du profil est utile: pas d'hydratation du UserProfile
+    role = UserProfile.objects.filter(user=user).values_list("role", flat=True).first() or "visiteur"
 
-    logger.info(f"Connexion réussie: {email}")
+    logger.info("Connexion réussie: %s", email)
 
     return Response(
         {
@@ -347,7 +430,7 @@ def login(request):
                 "name": user.name,
                 "role": role,
             },
-            "token": token.key,
+            "token": token_key,
         },
     )
 
@@ -377,31 +460,20 @@ def password_reset_request(request):
 
     email = serializer.validated_data["email"]
 
-    try:
-        user = User.objects.get(email=email)
-        
-        # Utiliser le système de réinitialisation Django/Allauth
-        from django.contrib.auth.tokens import default_token_generator
-        from django.utils.http import urlsafe_base64_encode
-        from django.utils.encoding import force_bytes
-        
-        token = default_token_generator.make_token(user)
-        uid = urlsafe_base64_encode(force_bytes(user.pk))
-        
-        # TODO: Envoyer l'email avec le lien de réinitialisation
-        # reset_url = f"{settings.FRONTEND_URL}/reset-password/{uid}/{token}/"
-        
-        logger.info(f"Demande de réinitialisation de mot de passe pour: {email}")
-        
-        return Response(
-            {"message": "Un email de réinitialisation a été envoyé"},
-        )
+    # Token et email sont produits par une tâche Celery: la réponse ne dépend
+    # que de la recherche de l'id
+    user_id = User.objects.filter(email=email).values_list("id", flat=True).first()
+    if user_id is not None:
+        try:
+            send_password_reset.delay(user_id)
+        except Exception:
+            # Broker indisponible: même réponse que pour un email inconnu
+            logger.exception("Réinitialisation non mise en file pour: %s", email)
 
-    except User.DoesNotExist:
-        # Ne pas révéler si l'utilisateur existe ou non (sécurité)
-        return Response(
-            {"message": "Un email de réinitialisation a été envoyé"},
-        )
+    # Même réponse dans les deux cas: ne pas révéler si l'utilisateur existe (sécurité)
+    return Response(
+        {"message": "Un email de réinitialisation a été envoyé"},
+    )
 
 
 @extend_schema(
@@ -426,33 +498,9 @@ def account_me(request):
     """
     Récupérer les informations du compte utilisateur.
     """
-    user = request.user
-    
-    try:
-        profile = user.profile
-        role = profile.role
-        entreprise_data = None
-        
-        if profile.entreprise:
-            entreprise_data = {
-                "id": str(profile.entreprise.id),
-                "nom": profile.entreprise.nom,
-                "siren": profile.entreprise.siren,
-            }
-    except UserProfile.DoesNotExist:
-        role = "visiteur"
-        entreprise_data = None
-
-    return Response(
-        {
-            "id": user.id,
-            "email": user.email,
-            "name": user.name,
-            "role": role,
-            "entreprise": entreprise_data,
-            "created_at": user.date_joined,
-        },
-    )
+    # Utilisateur, profil et entreprise en une seule requête
+    user = _load_account_user(request.user.pk)
+    return Response(_build_account_response(user, getattr(user, "profile", None)))
 
 
 @extend_schema(
@@ -479,29 +527,34 @@ def account_update(request):
     """
     Mettre à jour le compte utilisateur.
     """
-    user = request.user
     serializer = UpdateAccountRequestSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    # Mise à jour du nom
-    if "name" in serializer.validated_data:
-        user.name = serializer.validated_data["name"]
-        user.save(update_fields=["name"])
-
-    # Mise à jour du téléphone dans le profil
-    if "phone" in serializer.validated_data:
-        try:
-            profile = user.profile
-            profile.phone = serializer.validated_data["phone"]
-            profile.save(update_fields=["phone"])
-        except UserProfile.DoesNotExist:
-            # Créer le profil si nécessaire
-            UserProfile.objects.create(
-                user=user,
-                phone=serializer.validated_data["phone"],
-            )
-
-    logger.info(f"Compte mis à jour: {user.email}")
-
-    # Retourner les données mises à jour
-    return account_me(request)
+    data = serializer.validated_data
+
+    user = _load_account_user(request.user.pk)
+    profile = getattr(user, "profile", None)
+
+    # Mises à jour nom + téléphone: UPDATE directs (sans signaux) dans une
+    # seule transaction, objets en mémoire tenus à jour pour la réponse.
+    with transaction.atomic():
+        if "name" in data:
+            User.objects.filter(pk=user.pk).update(name=data["name"])
+            user.name = data["name"]
+
+        if "phone" in data:
+            if profile is not None:
+                UserProfile.objects.filter(pk=profile.pk).update(
+                    phone=data["phone"],
+                    # .update() ne déclenche pas auto_now
+                    updated_at=timezone.now(),
+                )
+                profile.phone = data["phone"]
+            else:
+                # Créer le profil si nécessaire
+                profile = UserProfile.objects.create(user=user, phone=data["phone"])
+
+    logger.info("Compte mis à jour: %s", user.email)
+
+    # Retourner les données mises à jour (objets déjà en mémoire)
+    return Response(_build_account_response(user, profile))
@@ -1,9 +1,42 @@
+import logging
+
 from celery import shared_task
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
 
 from .models import User
 
+logger = logging.getLogger(__name__)
+
 
 @shared_task()
 def get_users_count():
     """A pointless Celery task to demonstrate usage."""
     return User.objects.count()
+
+
+@shared_task(ignore_result=True)
+def send_password_reset(user_id):
+    """
+    Générer le lien de réinitialisation de mot de passe et l'envoyer.
+
+    Exécuté hors de la requête pour que ni le calcul du token ni l'envoi
+    de l'email ne retardent la réponse de l'API. Ne renvoie rien: le token
+    ne doit pas être stocké dans le backend de résultats Celery.
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+
+    # Utiliser le système de réinitialisation Django/Allauth
+    token = default_token_generator.make_token(user)
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    _send_password_reset_email(user, uid, token)
+
+
+def _send_password_reset_email(user, uid, token):
+    """Envoyer le lien de réinitialisation à l'utilisateur."""
+    # TODO: Envoyer l'email avec le lien de réinitialisation
+    # reset_url = f"{settings.FRONTEND_URL}/reset-password/{uid}/{token}/"
+    logger.info("Demande de réinitialisation de mot de passe pour: %s", user.email)
@@ -0,0 +1,7 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+
+@pytest.fixture(scope="session")
+def api_rf() -> APIRequestFactory:
+    return APIRequestFactory()
@@ -0,0 +1,105 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from foxreviews.enterprise.models import Entreprise
+from foxreviews.userprofile.models import UserProfile
+from foxreviews.users.api import auth as auth_module
+from foxreviews.users.models import User
+
+
+def _me(api_rf: APIRequestFactory, user: User):
+    request = api_rf.get("/api/account/me/")
+    force_authenticate(request, user=user)
+    return auth_module.account_me(request)
+
+
+def _update(api_rf: APIRequestFactory, user: User, payload: dict):
+    request = api_rf.patch("/api/account/update/", payload, format="json")
+    force_authenticate(request, user=user)
+    return auth_module.account_update(request)
+
+
+@pytest.fixture
+def entreprise(db) -> Entreprise:
+    return Entreprise.objects.create(
+        siren="123456789",
+        siret="12345678900011",
+        nom="Entreprise Démo",
+        adresse="1 rue de Test",
+        code_postal="75001",
+        ville_nom="Paris",
+        naf_code="43.22A",
+        naf_libelle="Travaux de plomberie",
+    )
+
+
+@pytest.mark.django_db
+class TestAccountMe:
+    def test_me_without_entreprise(self, api_rf: APIRequestFactory, user: User, django_assert_num_queries):
+        # Utilisateur, profil et entreprise en une seule requête
+        with django_assert_num_queries(1):
+            resp = _me(api_rf, user)
+
+        assert resp.status_code == 200
+        assert resp.data == {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "role": UserProfile.Role.CLIENT,
+            "entreprise": None,
+            "created_at": user.date_joined,
+        }
+
+    def test_me_with_entreprise(
+        self,
+        api_rf: APIRequestFactory,
+        user: User,
+        entreprise: Entreprise,
+        django_assert_num_queries,
+    ):
+        UserProfile.objects.filter(user=user).update(entreprise=entreprise)
+
+        with django_assert_num_queries(1):
+            resp = _me(api_rf, user)
+
+        assert resp.data["entreprise"] == {
+            "id": str(entreprise.id),
+            "nom": entreprise.nom,
+            "siren": entreprise.siren,
+        }
+
+    def test_me_without_profile(self, api_rf: APIRequestFactory, user: User):
+        UserProfile.objects.filter(user=user).delete()
+
+        resp = _me(api_rf, user)
+
+        assert resp.status_code == 200
+        assert resp.data["role"] == "visiteur"
+        assert resp.data["entreprise"] is None
+
+
+@pytest.mark.django_db
+class TestAccountUpdate:
+    def test_update_persists_name_and_phone(self, api_rf: APIRequestFactory, user: User, django_assert_num_queries):
+        # SELECT, SAVEPOINT, UPDATE user, UPDATE profil, RELEASE SAVEPOINT
+        with django_assert_num_queries(5):
+            resp = _update(api_rf, user, {"name": "Nouveau Nom", "phone": "+33612345678"})
+
+        assert resp.status_code == 200
+        assert resp.data["name"] == "Nouveau Nom"
+        user.refresh_from_db()
+        assert user.name == "Nouveau Nom"
+        assert str(user.profile.phone) == "+33612345678"
+
+    def test_update_creates_missing_profile(self, api_rf: APIRequestFactory, user: User, django_assert_num_queries):
+        UserProfile.objects.filter(user=user).delete()
+
+        # SELECT, SAVEPOINT, INSERT profil, RELEASE SAVEPOINT
+        with django_assert_num_queries(4):
+            resp = _update(api_rf, user, {"phone": "+33612345678"})
+
+        assert resp.status_code == 200
+        profile = UserProfile.objects.get(user=user)
+        assert str(profile.phone) == "+33612345678"
+        assert resp.data["role"] == profile.role
@@ -0,0 +1,14 @@
+from foxreviews.users.api.auth import LoginRequestSerializer
+
+
+def test_cached_fields_are_copied_per_instance():
+    first = LoginRequestSerializer(data={"email": " A@Example.com ", "password": "x"})
+    second = LoginRequestSerializer(data={})
+
+    assert first.fields["email"] is not second.fields["email"]
+    assert first.fields["email"].parent is first
+    assert second.fields["email"].parent is second
+
+    assert first.is_valid()
+    assert first.validated_data["email"] == "a@example.com"
+    assert not second.is_valid()
@@ -0,0 +1,53 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from foxreviews.users.api import auth as auth_module
+from foxreviews.users.tests.factories import UserFactory
+
+PASSWORD = "StrongPassw0rd!"
+
+
+def _login(api_rf: APIRequestFactory, email: str, password: str = PASSWORD):
+    request = api_rf.post("/api/auth/login/", {"email": email, "password": password}, format="json")
+    return auth_module.login(request)
+
+
+@pytest.mark.django_db
+class TestLogin:
+    def test_login_succeeds(self, api_rf: APIRequestFactory):
+        user = UserFactory(email="client@example.com", password=PASSWORD)
+
+        resp = _login(api_rf, "client@example.com")
+
+        assert resp.status_code == 200
+        assert resp.data["user"]["id"] == user.id
+        assert resp.data["user"]["role"] == user.profile.role
+        assert resp.data["token"]
+
+    def test_login_rejects_wrong_password(self, api_rf: APIRequestFactory):
+        UserFactory(email="client@example.com", password=PASSWORD)
+
+        resp = _login(api_rf, "client@example.com", "WrongPassw0rd!")
+
+        assert resp.status_code == 401
+
+    def test_login_rejects_inactive_user(self, api_rf: APIRequestFactory):
+        UserFactory(email="client@example.com", password=PASSWORD, is_active=False)
+
+        resp = _login(api_rf, "client@example.com")
+
+        assert resp.status_code == 401
+
+    def test_login_rejects_unknown_email(self, api_rf: APIRequestFactory):
+        resp = _login(api_rf, "inconnu@example.com")
+
+        assert resp.status_code == 401
+
+    def test_login_matches_mixed_case_stored_email(self, api_rf: APIRequestFactory):
+        # normalize_email ne met en minuscules que le domaine
+        user = UserFactory(email="John.Doe@example.com", password=PASSWORD)
+
+        resp = _login(api_rf, "John.Doe@example.com")
+
+        assert resp.status_code == 200
+        assert resp.data["user"]["id"] == user.id
@@ -0,0 +1,40 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from foxreviews.users.api import auth as auth_module
+from foxreviews.users.tests.factories import UserFactory
+
+
+def _password_reset(api_rf: APIRequestFactory, email: str):
+    request = api_rf.post("/api/auth/password-reset/", {"email": email}, format="json")
+    return auth_module.password_reset_request(request)
+
+
+@pytest.mark.django_db
+class TestPasswordResetRequest:
+    def test_known_and_unknown_email_get_same_response(self, api_rf, monkeypatch):
+        user = UserFactory(email="client@example.com")
+        enqueued = []
+        monkeypatch.setattr(auth_module.send_password_reset, "delay", enqueued.append)
+
+        known = _password_reset(api_rf, "client@example.com")
+        unknown = _password_reset(api_rf, "inconnu@example.com")
+
+        assert enqueued == [user.id]
+        assert known.status_code == unknown.status_code == 200
+        assert known.data == unknown.data
+
+    def test_broker_failure_keeps_neutral_response(self, api_rf, monkeypatch):
+        UserFactory(email="client@example.com")
+
+        def _broker_down(user_id):
+            msg = "broker unreachable"
+            raise ConnectionError(msg)
+
+        monkeypatch.setattr(auth_module.send_password_reset, "delay", _broker_down)
+
+        known = _password_reset(api_rf, "client@example.com")
+        unknown = _password_reset(api_rf, "inconnu@example.com")
+
+        assert known.status_code == unknown.status_code == 200
+        assert known.data == unknown.data
@@ -5,9 +5,12 @@ from rest_framework.test import APIRequestFactory
 
 from foxreviews.userprofile.models import UserProfile
 from foxreviews.users.api import auth as auth_module
+from foxreviews.users.tests.factories import UserFactory
 
 
 class _DummyExists:
+    __slots__ = ("_exists",)
+
     def __init__(self, exists: bool):
         self._exists = exists
 
@@ -16,14 +19,24 @@ class _DummyExists:
 
 
 class _DummyQS:
+    __slots__ = ("_first",)
+
     def __init__(self, first_obj):
         self._first = first_obj
 
+    def order_by(self, *args):
+        return self
+
+    def values_list(self, *fields, flat=False):
+        return self
+
     def first(self):
         return self._first
 
 
 class _DummyUser:
+    __slots__ = ("email", "id", "name")
+
     def __init__(self, email: str, name: str = ""):
         self.id = 123
         self.email = email
@@ -31,68 +44,70 @@ class _DummyUser:
 
 
 class _DummyToken:
+    __slots__ = ("key",)
+
     def __init__(self, key: str = "test-token"):
         self.key = key
 
 
-class _DummyProfile:
-    def __init__(self, user, role, entreprise=None):
-        self.user = user
-        self.role = role
-        self.entreprise = entreprise
-        self.entreprise_id = getattr(entreprise, "id", None)
+class _DummyProfileQS:
+    __slots__ = ("_captured",)
 
-    def save(self, update_fields=None):
-        return None
+    def __init__(self, captured: dict):
+        self._captured = captured
+
+    def update(self, **kwargs) -> int:
+        self._captured.update(kwargs)
+        return 1
 
 
 class _DummyEntreprise:
+    __slots__ = ("id", "siren", "siret")
+
     def __init__(self, siren: str, siret: str):
         self.id = "00000000-0000-0000-0000-000000000000"
         self.siren = siren
         self.siret = siret
 
 
-class TestRegisterLinksEnterprise:
-    @pytest.fixture
-    def api_rf(self) -> APIRequestFactory:
-        return APIRequestFactory()
+def _patch_register(monkeypatch: pytest.MonkeyPatch, *, entreprise_pk, create_user, captured_profile=None):
+    """Remplace en une fois les dépendances DB de `register`."""
+    patches = [
+        # Email not already used
+        (auth_module.User.objects, "filter", lambda **kwargs: _DummyExists(False)),
+        # Avoid password validation complexity
+        (auth_module, "validate_password", lambda value: None),
+        # Avoid opening a DB transaction
+        (auth_module.transaction, "atomic", contextlib.nullcontext),
+        (auth_module.User.objects, "create_user", create_user),
+        (auth_module.Entreprise.objects, "filter", lambda *args, **kwargs: _DummyQS(entreprise_pk)),
+        (auth_module.Token.objects, "create", lambda *, user: _DummyToken("tok")),
+    ]
+    if captured_profile is not None:
+        patches.append(
+            (auth_module.UserProfile.objects, "filter", lambda **kwargs: _DummyProfileQS(captured_profile)),
+        )
+    for target, name, value in patches:
+        monkeypatch.setattr(target, name, value)
 
+
+class TestRegisterLinksEnterprise:
     def test_register_links_by_siret_unit(self, api_rf: APIRequestFactory, monkeypatch: pytest.MonkeyPatch):
         dummy_entreprise = _DummyEntreprise(siren="123456789", siret="12345678900011")
 
-        # Avoid DB access: email uniqueness check
-        monkeypatch.setattr(auth_module.User.objects, "filter", lambda **kwargs: _DummyExists(False))
-        # Avoid password validation complexity
-        monkeypatch.setattr(auth_module, "validate_password", lambda value: None)
-        # Avoid opening a DB transaction
-        monkeypatch.setattr(auth_module.transaction, "atomic", contextlib.nullcontext)
-
         created_user = {}
 
         def _create_user(*, email, password, name):
             created_user.update({"email": email, "password": password, "name": name})
             return _DummyUser(email=email, name=name)
 
-        monkeypatch.setattr(auth_module.User.objects, "create_user", _create_user)
-
-        # Entreprise lookup by siret
-        from foxreviews.enterprise.models import Entreprise
-
-        monkeypatch.setattr(Entreprise.objects, "filter", lambda **kwargs: _DummyQS(dummy_entreprise))
+        captured_profile = {}
 
-        captured_defaults = {}
-
-        def _get_or_create(*, user, defaults):
-            captured_defaults.update(defaults)
-            return _DummyProfile(user=user, role=defaults.get("role"), entreprise=defaults.get("entreprise")), True
-
-        monkeypatch.setattr(auth_module.UserProfile.objects, "get_or_create", _get_or_create)
-
-        monkeypatch.setattr(
-            auth_module.Token.objects,
-            "get_or_create",
-            lambda *, user: (_DummyToken("tok"), True),
+        _patch_register(
+            monkeypatch,
+            entreprise_pk=dummy_entreprise.id,
+            create_user=_create_user,
+            captured_profile=captured_profile,
         )
 
         payload = {
@@ -106,27 +121,19 @@ class TestRegisterLinksEnterprise:
 
         assert resp.status_code == 201
         assert created_user["email"] == "client@example.com"
-        assert captured_defaults["role"] == UserProfile.Role.CLIENT
-        assert captured_defaults["entreprise"] is dummy_entreprise
+        assert resp.data["token"] == "tok"
+        assert captured_profile["role"] == UserProfile.Role.CLIENT
+        assert captured_profile["entreprise_id"] == dummy_entreprise.id
 
     def test_register_rejects_unknown_siren_unit(self, api_rf: APIRequestFactory, monkeypatch: pytest.MonkeyPatch):
-        # Avoid DB access: email uniqueness check
-        monkeypatch.setattr(auth_module.User.objects, "filter", lambda **kwargs: _DummyExists(False))
-        # Avoid password validation complexity
-        monkeypatch.setattr(auth_module, "validate_password", lambda value: None)
-
-        # Entreprise lookup returns nothing
-        from foxreviews.enterprise.models import Entreprise
-
-        monkeypatch.setattr(Entreprise.objects, "filter", lambda **kwargs: _DummyQS(None))
-
         create_user_called = {"called": False}
 
         def _create_user(*, email, password, name):
             create_user_called["called"] = True
             return _DummyUser(email=email, name=name)
 
-        monkeypatch.setattr(auth_module.User.objects, "create_user", _create_user)
+        # Entreprise lookup returns nothing
+        _patch_register(monkeypatch, entreprise_pk=None, create_user=_create_user)
 
         payload = {
             "email": "client2@example.com",
@@ -139,3 +146,49 @@ class TestRegisterLinksEnterprise:
         assert resp.status_code == 400
         assert "Entreprise introuvable" in (resp.data.get("error") or "")
         assert create_user_called["called"] is False
+
+
+@pytest.mark.django_db
+def test_register_rejects_existing_email(api_rf: APIRequestFactory):
+    entreprise = auth_module.Entreprise.objects.create(
+        siren="123456789",
+        siret="12345678900011",
+        nom="Entreprise Démo",
+        adresse="1 rue de Test",
+        code_postal="75001",
+        ville_nom="Paris",
+        naf_code="43.22A",
+        naf_libelle="Travaux de plomberie",
+    )
+    UserFactory(email="client@example.com")
+    users_before = auth_module.User.objects.count()
+    profiles_before = UserProfile.objects.count()
+
+    payload = {
+        "email": "client@example.com",
+        "password": "StrongPassw0rd!",
+        "siret": entreprise.siret,
+    }
+    request = api_rf.post("/api/auth/register/", payload, format="json")
+    resp = auth_module.register(request)
+
+    assert resp.status_code == 400
+    assert resp.data == {"email": ["Cet email est déjà utilisé."]}
+    assert auth_module.User.objects.count() == users_before
+    assert UserProfile.objects.count() == profiles_before
+
+
+@pytest.mark.django_db
+def test_register_reports_existing_email_before_unknown_siret(api_rf: APIRequestFactory):
+    UserFactory(email="client@example.com")
+
+    payload = {
+        "email": "client@example.com",
+        "password": "StrongPassw0rd!",
+        "siret": "99999999900011",
+    }
+    request = api_rf.post("/api/auth/register/", payload, format="json")
+    resp = auth_module.register(request)
+
+    assert resp.status_code == 400
+    assert resp.data == {"email": ["Cet email est déjà utilisé."]}
@@ -1,4 +1,3 @@
-import pytest
 from rest_framework.test import APIRequestFactory
 
 from foxreviews.users.api.views import UserViewSet
@@ -6,10 +5,6 @@ from foxreviews.users.models import User
 
 
 class TestUserViewSet:
-    @pytest.fixture
-    def api_rf(self) -> APIRequestFactory:
-        return APIRequestFactory()
-
     def test_get_queryset(self, user: User, api_rf: APIRequestFactory):
         view = UserViewSet()
         request = api_rf.get("/fake-url/")
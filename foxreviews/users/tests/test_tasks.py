@@ -1,7 +1,10 @@
 import pytest
 from celery.result import EagerResult
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.contrib.auth.tokens import default_token_generator
 
 from foxreviews.users.tasks import get_users_count
+from foxreviews.users.tasks import send_password_reset
 from foxreviews.users.tests.factories import UserFactory
 
 pytestmark = pytest.mark.django_db
@@ -15,3 +18,30 @@ def test_user_count(settings):
     task_result = get_users_count.delay()
     assert isinstance(task_result, EagerResult)
     assert task_result.result == batch_size
+
+
+def test_send_password_reset(settings, monkeypatch):
+    """The password reset task builds a valid token and keeps no result."""
+    user = UserFactory()
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    tokens = []
+
+    def _make_token(u):
+        token = PasswordResetTokenGenerator.make_token(default_token_generator, u)
+        tokens.append(token)
+        return token
+
+    monkeypatch.setattr(default_token_generator, "make_token", _make_token)
+    task_result = send_password_reset.delay(user.pk)
+    assert isinstance(task_result, EagerResult)
+    assert task_result.result is None
+    assert len(tokens) == 1
+    assert default_token_generator.check_token(user, tokens[0])
+
+
+def test_send_password_reset_unknown_user(settings, monkeypatch):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    tokens = []
+    monkeypatch.setattr(default_token_generator, "make_token", tokens.append)
+    send_password_reset.delay(0)
+    assert tokens == []
@@ -9,45 +9,66 @@ Usage:
     python scripts/cron_helper.py status            # Statut du service cron
 """
 
+import asyncio
 import subprocess
 import sys
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
-TASKS = {
-    "import_insee": {
-        "cmd": "python manage.py import_insee_by_villes --limit-per-dept 50 --min-population 10000",
-        "desc": "Import quotidien INSEE basé sur les villes",
-        "schedule": "Tous les jours à 2h",
-    },
-    "deactivate_sponsorships": {
-        "cmd": "python manage.py deactivate_expired_sponsorships",
-        "desc": "Désactivation sponsorisations expirées",
-        "schedule": "Tous les jours à 1h",
-    },
-    "regenerate_reviews": {
-        "cmd": "python manage.py regenerate_expired_reviews --batch-size 10 --limit 50",
-        "desc": "Régénération avis IA",
-        "schedule": "Tous les jours à 2h30",
-    },
-    "update_scores": {
-        "cmd": "python manage.py update_pro_scores",
-        "desc": "Mise à jour scores Pro",
-        "schedule": "Tous les jours à 3h",
-    },
-    "cleanup_temp": {
-        "cmd": "find /tmp -name 'foxreviews_*' -mtime +1 -delete",
-        "desc": "Nettoyage fichiers temporaires",
-        "schedule": "Tous les jours à 4h",
-    },
-}
+
+@dataclass(frozen=True, slots=True)
+class TaskSpec:
+    id: str
+    cmd: str
+    desc: str
+    schedule: str
+
+
+TASKS: tuple[TaskSpec, ...] = (
+    TaskSpec(
+        id="import_insee",
+        cmd="python manage.py import_insee_by_villes --limit-per-dept 50 --min-population 10000",
+        desc="Import quotidien INSEE basé sur les villes",
+        schedule="Tous les jours à 2h",
+    ),
+    TaskSpec(
+        id="deactivate_sponsorships",
+        cmd="python manage.py deactivate_expired_sponsorships",
+        desc="Désactivation sponsorisations expirées",
+        schedule="Tous les jours à 1h",
+    ),
+    TaskSpec(
+        id="regenerate_reviews",
+        cmd="python manage.py regenerate_expired_reviews --batch-size 10 --limit 50",
+        desc="Régénération avis IA",
+        schedule="Tous les jours à 2h30",
+    ),
+    TaskSpec(
+        id="update_scores",
+        cmd="python manage.py update_pro_scores",
+        desc="Mise à jour scores Pro",
+        schedule="Tous les jours à 3h",
+    ),
+    TaskSpec(
+        id="cleanup_temp",
+        cmd="find /tmp -name 'foxreviews_*' -mtime +1 -delete",
+        desc="Nettoyage fichiers temporaires",
+        schedule="Tous les jours à 4h",
+    ),
+)
+
+_BY_ID = {task.id: task for task in TASKS}
 
 
 def run_docker_command(cmd: str, container: str = "foxreviews_local_django") -> None:
     """Exécute une commande dans le container Docker."""
-    full_cmd = f"docker exec -it {container} /bin/bash -c 'cd /app && {cmd}'"
     print(f"\n🚀 Exécution: {cmd}\n")
-    subprocess.run(full_cmd, shell=True)
+    # argv direct: pas de shell côté hôte, seul bash dans le container interprète cmd
+    subprocess.run(
+        ["docker", "exec", "-it", container, "/bin/bash", "-c", f"cd /app && {cmd}"],
+        check=False,
+    )
 
 
 def list_tasks():
@@ -55,11 +76,11 @@ def list_tasks():
     print("\n📅 TÂCHES PLANIFIÉES FOX-REVIEWS\n")
     print("=" * 80)
     
-    for task_id, task in TASKS.items():
-        print(f"\n📌 {task_id}")
-        print(f"   Description: {task['desc']}")
-        print(f"   Planification: {task['schedule']}")
-        print(f"   Commande: {task['cmd']}")
+    for task in TASKS:
+        print(f"\n📌 {task.id}")
+        print(f"   Description: {task.desc}")
+        print(f"   Planification: {task.schedule}")
+        print(f"   Commande: {task.cmd}")
     
     print("\n" + "=" * 80)
     print(f"\nTotal: {len(TASKS)} tâches planifiées")
@@ -68,49 +89,69 @@ def list_tasks():
 
 def run_task(task_id: str):
     """Exécute une tâche manuellement."""
-    if task_id not in TASKS:
+    task = _BY_ID.get(task_id)
+    if task is None:
         print(f"❌ Tâche '{task_id}' inconnue")
-        print(f"\nTâches disponibles: {', '.join(TASKS.keys())}")
+        print(f"\nTâches disponibles: {', '.join(_BY_ID)}")
         sys.exit(1)
-    
-    task = TASKS[task_id]
+
     print(f"\n{'=' * 80}")
-    print(f"📋 Tâche: {task['desc']}")
-    print(f"⏰ Planification normale: {task['schedule']}")
+    print(f"📋 Tâche: {task.desc}")
+    print(f"⏰ Planification normale: {task.schedule}")
     print(f"{'=' * 80}")
     
-    run_docker_command(task["cmd"])
+    run_docker_command(task.cmd)
 
 
 def show_logs():
     """Affiche les logs cron."""
     print("\n📜 LOGS CRON\n")
     subprocess.run(
-        "docker exec foxreviews_local_cron tail -n 50 /var/log/cron.log",
-        shell=True,
+        ["docker", "exec", "foxreviews_local_cron", "tail", "-n", "50", "/var/log/cron.log"],
+        check=False,
     )
 
 
+_STATUS_SECTIONS = (
+    ("\n🐳 Container:", ("docker-compose", "ps", "cron")),
+    ("\n📅 Crontab actif:", ("docker", "exec", "foxreviews_local_cron", "crontab", "-l")),
+    # Le pipe est exécuté par le shell du container
+    (
+        "\n⚙️  Processus:",
+        ("docker", "exec", "foxreviews_local_cron", "sh", "-c", "ps aux | grep -E 'cron|CMD'"),
+    ),
+)
+
+
+async def _capture(argv: tuple[str, ...]) -> str:
+    """Exécute une commande et renvoie sa sortie (stdout + stderr)."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+    except FileNotFoundError:
+        return f"❌ Commande introuvable: {argv[0]}\n"
+    output, _ = await process.communicate()
+    return output.decode(errors="replace")
+
+
+async def _gather_status() -> list[str]:
+    # Les trois appels docker sont indépendants: lancés en parallèle
+    return await asyncio.gather(*(_capture(argv) for _title, argv in _STATUS_SECTIONS))
+
+
 def show_status():
     """Affiche le statut du service cron."""
     print("\n📊 STATUT SERVICE CRON\n")
     print("=" * 80)
-    
-    # Container status
-    print("\n🐳 Container:")
-    subprocess.run("docker-compose ps cron", shell=True)
-    
-    # Crontab actif
-    print("\n📅 Crontab actif:")
-    subprocess.run("docker exec foxreviews_local_cron crontab -l", shell=True)
-    
-    # Processus cron
-    print("\n⚙️  Processus:")
-    subprocess.run(
-        "docker exec foxreviews_local_cron ps aux | grep -E 'cron|CMD'",
-        shell=True,
-    )
-    
+
+    outputs = asyncio.run(_gather_status())
+    for (title, _argv), output in zip(_STATUS_SECTIONS, outputs, strict=True):
+        print(title)
+        print(output, end="")
+
     print("\n" + "=" * 80)
 
 
@@ -127,7 +168,7 @@ def main():
     elif command == "run":
         if len(sys.argv) < 3:
             print("❌ Usage: python scripts/cron_helper.py run <task_id>")
-            print(f"\nTâches disponibles: {', '.join(TASKS.keys())}")
+            print(f"\nTâches disponibles: {', '.join(_BY_ID)}")
             sys.exit(1)
         
         task_id = sys.argv[2]
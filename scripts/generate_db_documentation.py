@@ -6,8 +6,10 @@ _db_table/fields so the output matches migrations/model state.
 Usage:
   python scripts/generate_db_documentation.py --output docs/DATABASE_COMPLETE.md
 
-By default it uses production settings, but it will not attempt any DB
-connection; it only imports settings and models.
+By default it uses the lightweight ``config.settings.docs`` settings (base
+settings, so the same INSTALLED_APPS and models as production without the
+Sentry/S3/email setup). It never opens a DB connection; it only populates the
+app registry.
 """
 
 from __future__ import annotations
@@ -19,6 +21,23 @@ import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+from typing import TextIO
+
+_WS_RE = re.compile(r"\s+")
+
+_TABLE_HEADER = (
+    "| Colonne | Champ Django | Type | NULL | PK | UNIQUE | INDEX | MaxLen | Default / Relation |\n",
+    "|---|---|---|---|---|---|---|---|---|\n",
+)
+
+# get_internal_type() / _meta.label only depend on the class, not the instance
+_INTERNAL_TYPE_CACHE: dict[type, str] = {}
+_MODEL_LABEL_CACHE: dict[type, str] = {}
+# Only literals whose equal values always render the same text (unlike
+# Decimal("1.0") == Decimal("1.00")) are cached; callables hash by identity.
+_CACHEABLE_DEFAULT_TYPES = frozenset({bool, int, str, type(None)})
+# Keyed by (type, value) so that True and 1 stay distinct
+_DEFAULT_CACHE: dict[tuple[type, Any], str] = {}
 
 
 @dataclass(frozen=True)
@@ -36,16 +55,17 @@ def _read_env_kv(env_path: Path) -> list[EnvVar]:
         return []
 
     items: list[EnvVar] = []
-    for raw_line in env_path.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        key = key.strip()
-        value = value.strip().strip('"').strip("'")
-        items.append(EnvVar(key=key, value=value))
+    with env_path.open(encoding="utf-8") as env_file:
+        for raw_line in env_file:
+            line = raw_line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            items.append(EnvVar(key=key, value=value))
     return items
 
 
@@ -54,6 +74,22 @@ def _md_escape(text: str) -> str:
 
 
 def _short_default(value: Any) -> str:
+    # Most fields share a handful of defaults (True, 0, "", dict, uuid4...)
+    value_type = type(value)
+    if value_type not in _CACHEABLE_DEFAULT_TYPES and not callable(value):
+        return _format_default(value)
+    key = (value_type, value)
+    try:
+        cached = _DEFAULT_CACHE.get(key)
+    except TypeError:
+        # Unhashable callable instance
+        return _format_default(value)
+    if cached is None:
+        cached = _DEFAULT_CACHE.setdefault(key, _format_default(value))
+    return cached
+
+
+def _format_default(value: Any) -> str:
     if value is None:
         return ""
     try:
@@ -64,30 +100,37 @@ def _short_default(value: Any) -> str:
     except Exception:
         return "<unrepr>"
 
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _WS_RE.sub(" ", s).strip()
     if len(s) > 60:
         s = s[:57] + "..."
     return s
 
 
-def build_markdown(*, workspace_root: Path) -> str:
+def _model_label(model: type) -> str:
+    label = _MODEL_LABEL_CACHE.get(model)
+    if label is None:
+        label = _MODEL_LABEL_CACHE.setdefault(model, model._meta.label)
+    return label
+
+
+def build_markdown(out: TextIO, *, workspace_root: Path) -> None:
+    """Write the Markdown documentation to ``out``, one line at a time."""
     # Make sure the repository root is importable (so `config.*` resolves)
     # even when the script is executed from inside the `scripts/` folder.
     repo_root_str = str(workspace_root)
     if repo_root_str not in sys.path:
         sys.path.insert(0, repo_root_str)
 
-    # Settings: default to production, as requested.
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+    # Settings: docs-only settings, the models are the same as in production.
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.docs")
 
-    # Ensure base settings loads .envs/.production when running locally.
-    # It already does this based on DJANGO_SETTINGS_MODULE.
-
-    import django  # noqa: WPS433
+    # Only the app registry is needed to walk _meta: no logging configuration
+    # nor script prefix as done by django.setup().
+    from django.apps import apps  # noqa: WPS433
+    from django.conf import settings  # noqa: WPS433
 
-    django.setup()
+    apps.populate(settings.INSTALLED_APPS)
 
-    from django.apps import apps  # noqa: WPS433
     from django.db import models  # noqa: WPS433
 
     compose_path = workspace_root / "docker-compose.production.yml"
@@ -95,88 +138,99 @@ def build_markdown(*, workspace_root: Path) -> str:
 
     postgres_env = {item.key: item.value for item in _read_env_kv(postgres_env_path)}
 
+    def emit(line: str = "") -> None:
+        out.write(line)
+        out.write("\n")
+
     # Header / connection section
-    lines: list[str] = []
-    lines.append("# Documentation Base de Données (Production) — FOX-Reviews")
-    lines.append("")
-    lines.append("Ce document est généré automatiquement depuis les modèles Django du projet (introspection du code).")
-    lines.append("Il décrit les tables/colonnes attendues par l’application. Il ne nécessite pas de connexion au Postgres.")
-    lines.append("")
-
-    lines.append("## 1) Connexion à PostgreSQL via Docker (docker-compose production)")
-    lines.append("")
-    lines.append("Le fichier compose de production est : `docker-compose.production.yml`.")
-    lines.append("Le service base de données est : `postgres`. Le conteneur charge ses variables via : `.envs/.production/.postgres`.")
-    lines.append("")
-    lines.append("### A. Démarrer PostgreSQL (si nécessaire)")
-    lines.append("")
-    lines.append("```bash")
-    lines.append("docker compose -f docker-compose.production.yml up -d postgres")
-    lines.append("```")
-    lines.append("")
-
-    lines.append("### B. Ouvrir un shell SQL (psql) dans le conteneur Postgres")
-    lines.append("")
-    lines.append("```bash")
-    lines.append("docker compose -f docker-compose.production.yml exec postgres psql -U \"$POSTGRES_USER\" -d \"$POSTGRES_DB\"")
-    lines.append("```")
-    lines.append("")
-
-    lines.append("### C. Via Django (dbshell)")
-    lines.append("")
-    lines.append("```bash")
-    lines.append("docker compose -f docker-compose.production.yml exec django python manage.py dbshell")
-    lines.append("```")
-    lines.append("")
-
-    lines.append("### D. Remarques")
-    lines.append("")
-    lines.append("- Dans le `docker-compose.production.yml`, Postgres n’expose pas de port vers l’hôte (pas de `ports:`), donc l’accès se fait via `docker compose exec`.")
-    lines.append("- Les données sont persistées via le volume `production_postgres_data` monté sur `/var/lib/postgresql/18/docker`.")
-    lines.append("")
-
-    lines.append("## 2) Credentials & paramètres DB (depuis .envs/.production/.postgres)")
-    lines.append("")
+    emit("# Documentation Base de Données (Production) — FOX-Reviews")
+    emit()
+    emit("Ce document est généré automatiquement depuis les modèles Django du projet (introspection du code).")
+    emit("Il décrit les tables/colonnes attendues par l’application. Il ne nécessite pas de connexion au Postgres.")
+    emit()
+
+    emit("## 1) Connexion à PostgreSQL via Docker (docker-compose production)")
+    emit()
+    emit("Le fichier compose de production est : `docker-compose.production.yml`.")
+    emit("Le service base de données est : `postgres`. Le conteneur charge ses variables via : `.envs/.production/.postgres`.")
+    emit()
+    emit("### A. Démarrer PostgreSQL (si nécessaire)")
+    emit()
+    emit("```bash")
+    emit("docker compose -f docker-compose.production.yml up -d postgres")
+    emit("```")
+    emit()
+
+    emit("### B. Ouvrir un shell SQL (psql) dans le conteneur Postgres")
+    emit()
+    emit("```bash")
+    emit("docker compose -f docker-compose.production.yml exec postgres psql -U \"$POSTGRES_USER\" -d \"$POSTGRES_DB\"")
+    emit("```")
+    emit()
+
+    emit("### C. Via Django (dbshell)")
+    emit()
+    emit("```bash")
+    emit("docker compose -f docker-compose.production.yml exec django python manage.py dbshell")
+    emit("```")
+    emit()
+
+    emit("### D. Remarques")
+    emit()
+    emit("- Dans le `docker-compose.production.yml`, Postgres n’expose pas de port vers l’hôte (pas de `ports:`), donc l’accès se fait via `docker compose exec`.")
+    emit("- Les données sont persistées via le volume `production_postgres_data` monté sur `/var/lib/postgresql/18/docker`.")
+    emit()
+
+    emit("## 2) Credentials & paramètres DB (depuis .envs/.production/.postgres)")
+    emit()
     if postgres_env:
-        lines.append("Variables détectées :")
-        lines.append("")
-        lines.append("| Clé | Valeur |")
-        lines.append("|---|---|")
-        for key in sorted(postgres_env.keys()):
-            value = postgres_env[key]
+        emit("Variables détectées :")
+        emit()
+        emit("| Clé | Valeur |")
+        emit("|---|---|")
+        for key, value in sorted(postgres_env.items()):
             # User asked to include username/password values from env.
             # We print them as-is, because they are already present in repo.
-            lines.append(f"| `{_md_escape(key)}` | `{_md_escape(value)}` |")
-        lines.append("")
+            emit(f"| `{_md_escape(key)}` | `{_md_escape(value)}` |")
+        emit()
         if postgres_env.get("POSTGRES_PASSWORD") in {"production", "debug"}:
-            lines.append("⚠️ **Sécurité** : `POSTGRES_PASSWORD` ressemble à un mot de passe placeholder. À changer pour une valeur forte en production.")
-            lines.append("")
+            emit("⚠️ **Sécurité** : `POSTGRES_PASSWORD` ressemble à un mot de passe placeholder. À changer pour une valeur forte en production.")
+            emit()
     else:
-        lines.append("Aucune variable trouvée (fichier introuvable ou vide).")
-        lines.append("")
+        emit("Aucune variable trouvée (fichier introuvable ou vide).")
+        emit()
 
     if compose_path.exists():
-        lines.append("## 3) Référence compose")
-        lines.append("")
-        lines.append("- Compose: `docker-compose.production.yml`")
-        lines.append("- Services DB/Cache: `postgres`, `redis`")
-        lines.append("- Backend: `django` + workers (`celeryworker`, `cron`, etc.)")
-        lines.append("")
-
-    lines.append("## 4) Schéma (tables & colonnes)")
-    lines.append("")
-    lines.append("Format : une entrée par table (par modèle), avec ses colonnes et attributs principaux.")
-    lines.append("")
+        emit("## 3) Référence compose")
+        emit()
+        emit("- Compose: `docker-compose.production.yml`")
+        emit("- Services DB/Cache: `postgres`, `redis`")
+        emit("- Backend: `django` + workers (`celeryworker`, `cron`, etc.)")
+        emit()
+
+    emit("## 4) Schéma (tables & colonnes)")
+    emit()
+    emit("Format : une entrée par table (par modèle), avec ses colonnes et attributs principaux.")
+    emit()
 
     # Collect and sort models
-    all_models = [m for m in apps.get_models(include_auto_created=True) if not m._meta.proxy]
-    all_models.sort(key=lambda m: (m._meta.app_label, m._meta.model_name))
+    # (app_label, model_name) is unique, so the model itself is never compared
+    keyed = [
+        (m._meta.app_label, m._meta.model_name, m)
+        for m in apps.get_models(include_auto_created=True)
+        if not m._meta.proxy
+    ]
+    keyed.sort()
+    all_models = [model for _app_label, _model_name, model in keyed]
 
     current_app: str | None = None
 
     def _field_row(field: models.Field) -> str:
         col = field.column
-        internal = field.get_internal_type()
+        field_type = type(field)
+        internal = _INTERNAL_TYPE_CACHE.get(field_type)
+        if internal is None:
+            internal = _INTERNAL_TYPE_CACHE.setdefault(field_type, field.get_internal_type())
         null = "YES" if getattr(field, "null", False) else "NO"
         pk = "YES" if getattr(field, "primary_key", False) else ""
         unique = "YES" if getattr(field, "unique", False) else ""
@@ -192,53 +246,49 @@ def build_markdown(*, workspace_root: Path) -> str:
 
         rel = ""
         if isinstance(field, models.ForeignKey):
-            rel = f"FK → {field.remote_field.model._meta.label}"
+            rel = f"FK → {_model_label(field.remote_field.model)}"
         elif isinstance(field, models.OneToOneField):
-            rel = f"O2O → {field.remote_field.model._meta.label}"
-
-        return "| {} | {} | {} | {} | {} | {} | {} | {} | {} |".format(
-            f"`{_md_escape(col)}`",
-            f"`{_md_escape(field.name)}`",
-            f"`{_md_escape(internal)}`",
-            null,
-            pk,
-            unique,
-            db_index,
-            f"`{_md_escape(ml)}`" if ml else "",
-            f"`{_md_escape(default)}`" if default else (f"`{_md_escape(rel)}`" if rel else ""),
+            rel = f"O2O → {_model_label(field.remote_field.model)}"
+
+        ml_cell = f"`{_md_escape(ml)}`" if ml else ""
+        last = default or rel
+        last_cell = f"`{_md_escape(last)}`" if last else ""
+
+        return (
+            f"| `{_md_escape(col)}` | `{_md_escape(field.name)}` | `{_md_escape(internal)}` "
+            f"| {null} | {pk} | {unique} | {db_index} | {ml_cell} | {last_cell} |"
         )
 
     for model in all_models:
         app_label = model._meta.app_label
         if current_app != app_label:
             current_app = app_label
-            lines.append(f"### App: `{current_app}`")
-            lines.append("")
+            emit(f"### App: `{current_app}`")
+            emit()
 
         table_name = model._meta.db_table
         managed = model._meta.managed
         auto_created = model._meta.auto_created
-        lines.append(f"#### Table: `{table_name}` (Model: `{model._meta.label}`)")
-        lines.append("")
-        lines.append(f"- Managed par Django: `{managed}`")
+        emit(f"#### Table: `{table_name}` (Model: `{model._meta.label}`)")
+        emit()
+        emit(f"- Managed par Django: `{managed}`")
         if auto_created:
-            lines.append("- Table auto-créée (ex: many-to-many / internal Django)")
-        lines.append("")
+            emit("- Table auto-créée (ex: many-to-many / internal Django)")
+        emit()
 
         # Fields
-        lines.append("| Colonne | Champ Django | Type | NULL | PK | UNIQUE | INDEX | MaxLen | Default / Relation |")
-        lines.append("|---|---|---|---|---|---|---|---|---|")
+        out.writelines(_TABLE_HEADER)
 
         # local_fields includes PK and FK, excludes M2M
         for field in list(model._meta.local_fields):
-            lines.append(_field_row(field))
+            emit(_field_row(field))
 
         # Many-to-many
         for m2m in list(model._meta.local_many_to_many):
-            through = m2m.remote_field.through
-            through_table = getattr(through._meta, "db_table", "")
-            target_label = m2m.remote_field.model._meta.label
-            lines.append(
+            # Same table name for auto-created and explicit through models
+            through_table = m2m.m2m_db_table()
+            target_label = _model_label(m2m.remote_field.model)
+            emit(
                 "| {} | {} | {} | {} | {} | {} | {} | {} | {} |".format(
                     f"`{_md_escape(m2m.column)}`" if getattr(m2m, "column", None) else "",
                     f"`{_md_escape(m2m.name)}`",
@@ -252,9 +302,7 @@ def build_markdown(*, workspace_root: Path) -> str:
                 )
             )
 
-        lines.append("")
-
-    return "\n".join(lines) + "\n"
+        emit()
 
 
 def main() -> int:
@@ -272,8 +320,15 @@ def main() -> int:
         output_path = workspace_root / output_path
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    content = build_markdown(workspace_root=workspace_root)
-    output_path.write_text(content, encoding="utf-8")
+    # Write next to the target and swap it in only once the whole document is
+    # built, so a failure never leaves the existing doc empty or truncated.
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8", buffering=1 << 16) as out:
+            build_markdown(out, workspace_root=workspace_root)
+        tmp_path.replace(output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
     print(f"Wrote: {output_path}")
     return 0
 